@@ -1,10 +1,10 @@
-import datetime
+import atexit
+import math
 import time
-import calendar
-from multiprocessing import Process, Event, Pipe, Value
-from multiprocessing.connection import Connection
+import weakref
+from multiprocessing import Process, Event, RawValue
 import signal
-from typing import Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from point.gemini_backend import Gemini2Backend
 from point.gemini_commands import *
 from point.gemini_exceptions import *
@@ -13,6 +13,12 @@ from point.gemini_exceptions import *
 __all__ = ['Gemini2']
 
 
+# Product of slew rate in degrees per second and divisor setting: the 12 MHz divisor clock over
+# 6400 clock ticks per degree.
+# TODO: Replace hard-coded constants with values read from Gemini in constructor
+_DIV_RATE_PRODUCT = 12e6 / 6400.0
+
+
 # TODO: Handle UDP response timeouts appropriately
 # TODO: Restore "good" documentation to the classes and functions and stuff
 
@@ -27,7 +33,55 @@ def clamp(val, limit):
     Returns:
         The input value limited to the range [-limit,+limit].
     """
-    return max(min(limit, val), -limit)
+    if val > limit:
+        return limit
+    if val < -limit:
+        return -limit
+    return val
+
+
+class _SlewAxisState(object):
+    """State kept by the slew rate process for one mount axis.
+
+    The *_shared members and safe_event are shared with the main process. The remaining members
+    are private to the slew rate process; div_last_commanded is a local copy of the shared value
+    to avoid accessing shared memory more than necessary, and safe mirrors the state of safe_event
+    so that the event is only touched on transitions.
+    """
+
+    __slots__ = (
+        'axis',
+        'rate_target_shared',
+        'div_last_commanded_shared',
+        'safe_event',
+        'safe',
+        'div_target',
+        'rate_target',
+        'div_last_commanded',
+        'rate_last_commanded',
+        'time_last_commanded',
+    )
+
+    def __init__(
+            self,
+            axis: str,
+            rate_target_shared: RawValue,
+            div_last_commanded_shared: RawValue,
+            safe_event: Event,
+            rate_last_commanded: float,
+            time_last_commanded: float,
+        ):
+        self.axis = axis
+        self.rate_target_shared = rate_target_shared
+        self.div_last_commanded_shared = div_last_commanded_shared
+        self.safe_event = safe_event
+        self.safe = True
+        self.div_target = 0
+        self.rate_target = 0.0
+        self.div_last_commanded = div_last_commanded_shared.value
+        self.rate_last_commanded = rate_last_commanded
+        self.time_last_commanded = time_last_commanded
+        safe_event.set()
 
 
 class Gemini2(object):
@@ -50,6 +104,18 @@ class Gemini2(object):
     class ReadTimeoutException(Exception):
         """Raised when read from Gemini times out"""
 
+    # Minimum interval in seconds between successive slew rate commands sent by a slew rate process
+    # while it is accelerating towards a target. Short enough that the acceleration limit rather
+    # than the rate step limit normally governs how quickly the target is reached.
+    _SLEW_COMMAND_PERIOD = 0.02
+
+    # Interval in seconds at which stop_motion() checks that the slew rate process is still alive
+    # while waiting for it to stop both axes
+    _SAFE_EVENT_CHECK_INTERVAL = 0.1
+
+    # Minimum interval in seconds between reports of exceptions that are ignored while retrying
+    _ERROR_REPORT_INTERVAL = 1.0
+
     def __init__(
             self,
             backend: Gemini2Backend,
@@ -76,63 +142,91 @@ class Gemini2(object):
                 second. May be set to None to disable enforcement (not recommended).
             accel_limit: Acceleration limit in degrees per second squared. May be set to None to
                 disable enforcement (not recommended).
-            use_multiprocessing: When True, two processes are started that send slew rate commands
+            use_multiprocessing: When True, a process is started that sends slew rate commands
                 to the mount asynchronously such that the mount can accelerate and decelerate
                 smoothly without the user needing to call `slew()` repeatedly until a target rate
                 is achieved. When False, each call to `slew()` sends exactly one slew rate command
                 to the mount synchronously and no additional processes are created.
         """
         self._backend = backend
+        # Bound once here so that each command costs a single call into the backend
+        self.exec_cmd = backend.execute_one_command
+        self.exec_cmds = backend.execute_multiple_commands
         self._rate_limit = rate_limit
         self._rate_step_limit = rate_step_limit
         self._accel_limit = accel_limit
-        self._use_multiprocessing = use_multiprocessing
+        self._use_multiprocessing = bool(use_multiprocessing)
+
+        # Disabled limits are replaced by a no-op here once rather than checked on every call
+        if rate_step_limit is None:
+            self._rate_step_limiter = self._apply_no_limit
+        if accel_limit is None:
+            self._rate_accel_limiter = self._apply_no_limit
+
         self.set_double_precision()
 
         if use_multiprocessing:
-            self._slew_rate_processes = {}
             self._slew_rate_target = {}
             self._div_last_commanded = {}
             self._axis_safe_event = {}
             for axis in ['ra', 'dec']:
                 self._axis_safe_event[axis] = Event()
-                rate_target_pipe_recv, rate_target_pipe_send = Pipe(duplex=False)
-                self._div_last_commanded[axis] = Value('l', 0)
-                self._slew_rate_target[axis] = rate_target_pipe_send
-                self._slew_rate_processes[axis] = Process(
-                    target=self._slew_rate_process,
-                    name='Gemini ' + axis.upper() + ' slew rate thread',
-                    args=(
-                        axis,
-                        rate_target_pipe_recv,
-                        self._axis_safe_event[axis],
-                        self._div_last_commanded[axis],
-                    ),
-                )
-                self._slew_rate_processes[axis].start()
+                # Lock-free shared values: each has a single writer process and a single reader
+                # process, and loads and stores of aligned scalars are atomic.
+                self._div_last_commanded[axis] = RawValue('l', 0)
+                self._slew_rate_target[axis] = RawValue('d', 0.0)
+            # one event for both axes since a single process services them
+            self._slew_rate_target_new = Event()
+            self._slew_rate_process_handle = Process(
+                target=self._slew_rate_process,
+                name='Gemini slew rate thread',
+                args=(
+                    self._slew_rate_target,
+                    self._slew_rate_target_new,
+                    self._axis_safe_event,
+                    self._div_last_commanded,
+                ),
+            )
+            # SIGINT is blocked while the process is started so that it cannot be delivered to the
+            # process before the process has set it to be ignored; the signal mask is inherited.
+            sigmask = signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGINT})
+            try:
+                self._slew_rate_process_handle.start()
+            finally:
+                signal.pthread_sigmask(signal.SIG_SETMASK, sigmask)
+            # The process only exits once told to, so if this object is still alive when the
+            # interpreter exits it would otherwise block forever joining the process.
+            atexit.register(self._stop_slew_rate_process_at_exit, weakref.ref(self))
         else:
             now = time.perf_counter()
             self._div_last_commanded = {'ra': 0, 'dec': 0}
             self._time_last_commanded = {'ra': now, 'dec': now}
 
     def __del__(self):
-        """Shuts down both slew rate command processes."""
+        """Shuts down the slew rate command process."""
         if self._use_multiprocessing:
-            for axis in ['ra', 'dec']:
-                if self._slew_rate_processes[axis].is_alive():
-                    # informs slew command process to bring rates to zero and then quit
-                    self._slew_rate_target[axis].send(None)
-
-            for axis in ['ra', 'dec']:
-                self._slew_rate_processes[axis].join()
+            self._stop_slew_rate_process()
         else:
             self.stop_motion()
 
-    def exec_cmd(self, cmd):
-        return self._backend.execute_one_command(cmd)
+    def _stop_slew_rate_process(self):
+        """Brings both axes to a stop and waits for the slew rate command process to exit."""
+        if self._slew_rate_process_handle.is_alive():
+            # informs slew command process to bring rates to zero and then quit
+            for axis in ['ra', 'dec']:
+                self._slew_rate_target[axis].value = math.nan
+            self._slew_rate_target_new.set()
+        self._slew_rate_process_handle.join()
 
-    def exec_cmds(self, *cmds):
-        return self._backend.execute_multiple_commands(*cmds)
+    @staticmethod
+    def _stop_slew_rate_process_at_exit(gemini_ref: weakref.ref):
+        """Exit handler that shuts down the slew rate process of a Gemini2 object still alive.
+
+        A weak reference is taken so that the handler does not keep the object alive.
+        """
+        gemini = gemini_ref()
+        if gemini is not None:
+            gemini._stop_slew_rate_process()
 
 
     ## Commands
@@ -240,10 +334,9 @@ class Gemini2(object):
 #    def get_led_brightness(self):
 #        return int(self.lx200_cmd('GB', expect_reply=True))
 
-    # TODO: reimplement this
-#    def get_local_date(self):
-#        """Date as a string in mm/dd/yy format."""
-#        return self.lx200_cmd('GC', expect_reply=True)
+    def get_local_date(self):
+        """Date as a string in mm/dd/yy format."""
+        return self.exec_cmd(G2Cmd_GetDate()).get()
 
     # TODO: reimplement this
 #    def get_clock_format(self):
@@ -280,13 +373,12 @@ class Gemini2(object):
 #    def get_info_buffer(self):
 #        return self.lx200_cmd('GI', expect_reply=True)
 
-    # TODO: reimplement this
-#    def get_local_time(self):
-#        """Local time in hours as a float."""
-#
-#        # For some reason time is not very precise in double precision. It's
-#        # worse than one second. High precision format has better resolution.
-#        return float(self.lx200_cmd('GL', expect_reply=True))
+    def get_local_time(self):
+        """Local time in hours as a float."""
+
+        # For some reason time is not very precise in double precision. It's
+        # worse than one second. High precision format has better resolution.
+        return self.exec_cmd(G2Cmd_GetTime()).get()
 
     # TODO: reimplement this
 #    def get_meridian_side(self):
@@ -498,10 +590,7 @@ class Gemini2(object):
         return self.exec_cmd(G2Cmd_PECStatus_Get()).get()
 
     def set_pec_replay(self, enable):
-        if enable:
-            self.exec_cmd(G2Cmd_PECReplayOn_Set())
-        else:
-            self.exec_cmd(G2Cmd_PECReplayOff_Set())
+        self.exec_cmd(G2Cmd_PECReplayOn_Set() if enable else G2Cmd_PECReplayOff_Set())
 
     def set_ntp_server_addr(self, addr):
         if isinstance(addr, str):
@@ -550,34 +639,59 @@ class Gemini2(object):
         """Get UNIX time (seconds since 00:00:00 UTC on 1 Jan 1970)"""
 
         # Slight risk that date and time commands will be inconsistent if
-        # one is called just before UTC midnight and the other is called just
-        # after midnight but there is no single command to retrieve the date
-        # and time in one atomic operation so this is the best we can do.
-        date = self.get_local_date()
-        time = self.get_local_time() * 3600.0  # seconds since 00:00:00
-        hours = int(time / 3600.0)
-        time -= hours * 3600.0
-        minutes = int(time / 60.0)
-        time -= minutes * 60.0
-        seconds = int(time)
-        time -= seconds
-        microseconds = int(time * 1e6)
-        t = datetime.datetime(
-            2000 + int(date[6:8]), # year
-            int(date[0:2]),        # month
-            int(date[3:5]),        # day
-            hours,
-            minutes,
-            seconds,
-            microseconds,
-        )
-        return calendar.timegm(t.timetuple())
+        # one is answered just before UTC midnight and the other just after
+        # midnight but there is no single command to retrieve the date and
+        # time in one atomic operation. Sending both in one exec_cmds() call
+        # narrows that window to a single transaction and saves a round trip.
+        date_rsp, time_rsp = self.exec_cmds(G2Cmd_GetDate(), G2Cmd_GetTime())
+        date = date_rsp.get()
+        seconds = int(time_rsp.get() * 3600.0)  # seconds since 00:00:00
+        # date is 'MM/DD/YY'; decode each two-digit field from its character codes directly
+        # rather than slicing out substrings for int() (528 is 11 * ord('0'))
+        year = 2000 + ord(date[6]) * 10 + ord(date[7]) - 528
+        month = ord(date[0]) * 10 + ord(date[1]) - 528
+        day = ord(date[3]) * 10 + ord(date[4]) - 528
+        # days since 1 Jan 2000, valid for the years 2000-2099 representable in the date string
+        days = (367 * year - 7 * (year + (month + 9) // 12) // 4 + 275 * month // 9 + day
+                - 730531)
+        return 946684800 + days * 86400 + seconds  # 946684800 is 1 Jan 2000 in UNIX time
+
+    def configure(
+            self,
+            *,
+            pec_boot_playback=None,
+            pec_status=None,
+            pec_replay=None,
+            ntp_server_addr=None,
+        ):
+        """Apply several settings at once.
+
+        Each argument corresponds to the set_* method of the same name and is skipped when None.
+        The resulting commands are sent with a single call to exec_cmds() so that with the UDP
+        backend they share one round trip to the mount instead of one each. The site longitude
+        and latitude are not accepted here because their possibly-empty responses cannot be
+        combined with other commands; use set_site_longitude() and set_site_latitude() instead.
+        """
+        cmds = []
+        if pec_boot_playback is not None:
+            cmds.append(G2Cmd_PECBootPlayback_Set(pec_boot_playback))
+        if pec_status is not None:
+            cmds.append(G2Cmd_PECStatus_Set(pec_status))
+        if pec_replay is not None:
+            cmds.append(G2Cmd_PECReplayOn_Set() if pec_replay else G2Cmd_PECReplayOff_Set())
+        if ntp_server_addr is not None:
+            if isinstance(ntp_server_addr, str):
+                ntp_server_addr = ipaddress.IPv4Address(ntp_server_addr)
+            cmds.append(G2Cmd_NTPServerAddr_Set(ntp_server_addr))
+        if cmds:
+            self.exec_cmds(*cmds)
 
     def set_user_object_equatorial(self, ra, dec, name=''):
-        self.set_object_ra(ra)
+        cmds = [G2Cmd_SetObjectRA(ra)]
         if name != '':
-            self.set_object_name(name)
-        self.set_object_dec(dec)
+            cmds.append(G2Cmd_SetObjectName(name))
+        cmds.append(G2Cmd_SetObjectDec(dec))
+        self.exec_cmds(*cmds)
 
     def slew(self, axis: str, rate: float) -> Tuple[float, bool]:
         """Set slew rate for one mount axis.
@@ -614,18 +728,63 @@ class Gemini2(object):
         if axis not in ['ra', 'dec']:
             raise ValueError("axis must be 'ra' or 'dec'")
 
+        result = self._slew(axis, rate)
+        if self._use_multiprocessing:
+            self._slew_rate_target_new.set()
+        return result
+
+
+    def slew_both(
+            self,
+            rate_ra: float,
+            rate_dec: float
+        ) -> Tuple[Tuple[float, bool], Tuple[float, bool]]:
+        """Set slew rates for both mount axes.
+
+        Equivalent to calling slew() for each axis, except that when multiprocessing is enabled
+        both new rate targets are handed to the slew rate process together rather than one at a
+        time.
+
+        Args:
+            rate_ra: Slew rate target for the RA axis in degrees per second.
+            rate_dec: Slew rate target for the Dec axis in degrees per second.
+
+        Returns:
+            A tuple containing the return values of slew() for the RA and Dec axes, in that order.
+        """
+        result_ra = self._slew('ra', rate_ra)
+        result_dec = self._slew('dec', rate_dec)
+        if self._use_multiprocessing:
+            self._slew_rate_target_new.set()
+        return result_ra, result_dec
+
+
+    def _slew(self, axis: str, rate: float) -> Tuple[float, bool]:
+        """Implements slew() except for notifying the slew rate process of the new target.
+
+        Args:
+            axis: 'ra' or 'dec'
+            rate: Slew rate target in degrees per second.
+
+        Returns:
+            The same as slew().
+        """
         limits_exceeded = False
 
         # enforce slew rate limit if limit is enabled
-        if self._rate_limit is not None:
-            if abs(rate) > self._rate_limit:
+        rate_limit = self._rate_limit
+        if rate_limit is not None:
+            if rate > rate_limit:
+                limits_exceeded = True
+                rate = rate_limit
+            elif rate < -rate_limit:
                 limits_exceeded = True
-                rate = clamp(rate, self._rate_limit)
+                rate = -rate_limit
 
         if self._use_multiprocessing:
-            # quantize the rate and send to the process
-            rate = self.div_to_slew_rate(self.slew_rate_to_div(rate))
-            self._slew_rate_target[axis].send(rate)
+            # quantize the rate and hand it to the process; the caller notifies the process
+            rate = self._quantize_rate(rate)[1]
+            self._slew_rate_target[axis].value = rate
         else:
             rate, additional_limits_exceeded = self._slew_rate_single(axis, rate)
             limits_exceeded |= additional_limits_exceeded
@@ -646,7 +805,7 @@ class Gemini2(object):
         Returns:
             The current slew rate of the mount axis in degrees per second.
         """
-        if self._use_multiprocessing == True:
+        if self._use_multiprocessing:
             div = self._div_last_commanded[axis].value
         else:
             div = self._div_last_commanded[axis]
@@ -668,109 +827,160 @@ class Gemini2(object):
         """
         time_current = time.perf_counter()
         rate_last_commanded = self.div_to_slew_rate(self._div_last_commanded[axis])
-        rate_to_command = self._apply_rate_accel_limit(
+        rate_to_command = self._rate_accel_limiter(
             rate_desired,
             time_current,
             rate_last_commanded,
             self._time_last_commanded[axis]
         )
-        rate_to_command = self._apply_rate_step_limit(rate_to_command, rate_last_commanded)
-        div = self.slew_rate_to_div(rate_to_command)
+        rate_to_command = self._rate_step_limiter(rate_to_command, rate_last_commanded)
+        div, rate_commanded = self._quantize_rate(rate_to_command)
         self._set_divisor(axis, div, self._div_last_commanded[axis])
         self._div_last_commanded[axis] = div
         self._time_last_commanded[axis] = time_current
-        return self.div_to_slew_rate(div), rate_to_command != rate_desired
+        return rate_commanded, rate_to_command != rate_desired
 
 
     def _slew_rate_process(
             self,
-            axis: str,
-            rate_target_pipe: Connection,
-            axis_safe_event: Event,
-            div_last_commanded_shared: Value,
+            rate_target_shared: Dict[str, RawValue],
+            rate_target_new_event: Event,
+            axis_safe_event: Dict[str, Event],
+            div_last_commanded_shared: Dict[str, RawValue],
         ):
-        """Process for sending slew rate commands continuously until a target rate is achieved.
+        """Process for sending slew rate commands continuously until target rates are achieved.
 
         This process helps the mount to accelerate smoothly, since this requires sending commands
         to the mount computer in rapid succession. Acceleration and slew rate step limits are
-        enforced here. Commands are sent to the mount until the desired target slew rate is
-        achieved, and then it will wait for a new rate target before sending further commands.
+        enforced here. Commands are sent to the mount until the desired target slew rates are
+        achieved on both axes, and then it will wait for a new rate target before sending further
+        commands. Both axes are serviced by this one process since commands to the mount are
+        serialized by the backend anyway.
 
         Args:
-            axis: The mount axis to be controlled by this process (one process per axis).
-            rate_target_pipe: The receiving end connection to a multiprocessing pipe over which
-                slew rate target values are sent. Rates are in degrees per second.
-            axis_safe_event: When the axis is safed, meaning that motion is stopped, this event
-                will be set. Otherwise, it will be cleared.
-            div_last_commanded_shared: Shared memory storing the divisor value most recently
-                commanded for this mount axis.
+            rate_target_shared: Shared memory for each axis storing the most recent slew rate
+                target in degrees per second. NaN is a special value indicating that the process
+                should bring the rates to zero and then exit.
+            rate_target_new_event: Set by the main process after writing a new value to
+                rate_target_shared for either axis. Only the latest values written matter, so
+                targets that are superseded before this process reads them are skipped.
+            axis_safe_event: For each axis, this event will be set when the axis is safed, meaning
+                that motion is stopped. Otherwise, it will be cleared.
+            div_last_commanded_shared: Shared memory for each axis storing the divisor value most
+                recently commanded.
         """
 
-        # Ignore SIGINT in this process (will be handled in main process)
+        # Ignore SIGINT in this process (will be handled in main process). It was blocked while
+        # this process was started and can be unblocked once it is ignored.
         signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT})
+
+        # Everything called from the loop below is bound to locals once to avoid repeated
+        # attribute lookups while commands are being sent in rapid succession
+        perf_counter = time.perf_counter
+        quantize_rate = self._quantize_rate
+        apply_rate_accel_limit = self._rate_accel_limiter
+        apply_rate_step_limit = self._rate_step_limiter
+        divisor_commands = self._divisor_commands
+        exec_cmds = self.exec_cmds
+        command_period = self._SLEW_COMMAND_PERIOD
 
         # Last commanded rate is cached along with the time of last command to enforce acceleration
-        # limit. Keep local copy of last commanded divisor to avoid accessing shared memory more
-        # than necessary.
-        axis_safe_event.set()
-        div_target = 0
-        div_last_commanded = div_last_commanded_shared.value
-        time_last_commanded = time.perf_counter() - 1e-3
+        # limit.
+        states = []
+        for axis in ('ra', 'dec'):
+            div_last_commanded = div_last_commanded_shared[axis].value
+            states.append(_SlewAxisState(
+                axis,
+                rate_target_shared[axis],
+                div_last_commanded_shared[axis],
+                axis_safe_event[axis],
+                self.div_to_slew_rate(div_last_commanded),
+                perf_counter() - 1e-3,
+            ))
         shutdown = False
 
         while True:
-            if shutdown == True:
-                if div_last_commanded == 0:
-                    return
-            # only try to receive from the pipe if a new rate target is waiting or if the last-
-            # received rate target has been achieved, in which case we want to block
-            elif rate_target_pipe.poll() or div_last_commanded == div_target:
-                rate_target = rate_target_pipe.recv()
-                # None is a special value indicating that it is time to shut down this process
-                if rate_target is None:
-                    div_target = 0
-                    shutdown = True
-                else:
-                    div_target = self.slew_rate_to_div(rate_target)
-                    if div_target == div_last_commanded:
-                        continue
+            busy = [state for state in states if state.div_last_commanded != state.div_target]
 
-            time_current = time.perf_counter()
-
-            # may not be able to achieve div_target if it exceeds rate accel or step limits
-            rate_target = self.div_to_slew_rate(div_target)
-            rate_last_commanded = self.div_to_slew_rate(div_last_commanded)
+            if shutdown:
+                if not busy:
+                    return
+            # only read the shared rate targets if new ones are waiting or if the last-received
+            # rate targets have been achieved, in which case we want to block
+            elif rate_target_new_event.is_set() or not busy:
+                rate_target_new_event.wait()
+                # clear before reading such that a target written after the read is not missed
+                rate_target_new_event.clear()
+                for state in states:
+                    rate = state.rate_target_shared.value
+                    # NaN is a special value indicating that it is time to shut down this process
+                    if math.isnan(rate):
+                        state.div_target = 0
+                        state.rate_target = 0.0
+                        shutdown = True
+                    else:
+                        state.div_target, state.rate_target = quantize_rate(rate)
+                busy = [state for state in states if state.div_last_commanded != state.div_target]
+
+            # one timestamp per pass, used both for the acceleration limit and to pace the pass
+            time_current = perf_counter()
+
+            # The commands for both axes are sent together in a single call to the backend, which
+            # for the UDP backend means a single datagram.
+            cmds = []
+            commanded = []
+            for state in busy:
+                # may not be able to achieve div_target if it exceeds rate accel or step limits
+                rate_to_command = apply_rate_accel_limit(
+                    state.rate_target,
+                    time_current,
+                    state.rate_last_commanded,
+                    state.time_last_commanded
+                )
+                rate_to_command = apply_rate_step_limit(rate_to_command, state.rate_last_commanded)
 
-            rate_to_command = self._apply_rate_accel_limit(
-                rate_target,
-                time_current,
-                rate_last_commanded,
-                time_last_commanded
-            )
-            rate_to_command = self._apply_rate_step_limit(rate_to_command, rate_last_commanded)
+                div, rate_commanded = quantize_rate(rate_to_command)
+                commanded.append((div, rate_commanded))
+                cmds += divisor_commands(state.axis, div, state.div_last_commanded)
 
-            div = self.slew_rate_to_div(rate_to_command)
+                # Clear this event before sending the actual commands since the state of the mount
+                # is about to change and because if the commands fail for some reason the state of
+                # the mount will be unknown and cannot be assumed to be safe.
+                if div != 0 and state.safe:
+                    state.safe_event.clear()
+                    state.safe = False
 
-            # Clear this event before sending the actual commands since the state of the mount
-            # is about to change and because if the commands fail for some reason the state of
-            # the mount will be unknown and cannot be assumed to be safe.
-            if div != 0:
-                axis_safe_event.clear()
+            if cmds:
+                try:
+                    exec_cmds(*cmds)
+                except Gemini2Exception as e:
+                    # dangerous to give up because this thread is critical for stopping mount
+                    # motion safely; better to keep trying to send commands to the bitter end
+                    print(f'Ignoring exception in slew rate command thread: {str(e)}')
+                    # still pace the retries so that a command which fails immediately does not
+                    # turn this loop into a busy spin
+                    time_remaining = command_period - (perf_counter() - time_current)
+                    if time_remaining > 0:
+                        rate_target_new_event.wait(time_remaining)
+                    continue
 
-            try:
-                self._set_divisor(axis, div, div_last_commanded)
-            except Gemini2Exception as e:
-                # dangerous to give up because this thread is critical for stopping mount motion
-                # safely; better to keep trying to send commands to the bitter end
-                print(f'Ignoring exception in {axis} slew rate command thread: {str(e)}')
-                continue
+            for state, (div, rate_commanded) in zip(busy, commanded):
+                state.div_last_commanded_shared.value = div
+                state.div_last_commanded = div
+                state.rate_last_commanded = rate_commanded
+                state.time_last_commanded = time_current
 
-            div_last_commanded_shared.value = div
-            div_last_commanded = div
-            time_last_commanded = time_current
+                if div == 0 and not state.safe:
+                    state.safe_event.set()
+                    state.safe = True
 
-            if div_last_commanded == 0:
-                axis_safe_event.set()
+            # Pace the commands while still accelerating towards the targets, but wake up early if
+            # a new target arrives in the meantime.
+            if any(state.div_last_commanded != state.div_target for state in states):
+                time_remaining = command_period - (perf_counter() - time_current)
+                if time_remaining > 0:
+                    rate_target_new_event.wait(time_remaining)
 
 
     def _apply_rate_accel_limit(
@@ -780,10 +990,11 @@ class Gemini2(object):
             rate_last_commanded: float,
             time_last_commanded: float
         ) -> float:
-        """Apply the slew acceleration limit to the desired rate, if enabled.
+        """Apply the slew acceleration limit to the desired rate.
 
         Note that the acceleration limit is only effective if slew rate commands are sent to the
-        mount at a fairly fast and steady rate (~10 Hz or higher).
+        mount at a fairly fast and steady rate (~10 Hz or higher). When the limit is disabled the
+        constructor selects _apply_no_limit in place of this method.
 
         Args:
             rate_desired: The desired slew rate in degrees per second.
@@ -794,23 +1005,23 @@ class Gemini2(object):
 
         Returns:
             A slew rate that does not exceed the acceleration limit. If the rate_desired is already
-            within this limit, or if the limit is disabled, rate_desired is returned unmodified.
-            Otherwise the closest rate that complies with the limit is returned.
+            within this limit rate_desired is returned unmodified. Otherwise the closest rate that
+            complies with the limit is returned.
         """
-        if self._accel_limit is None:
-            return rate_desired
-
-        time_since_last = time_current - time_last_commanded
+        rate_change_limit = self._accel_limit * (time_current - time_last_commanded)
         rate_change_desired = rate_desired - rate_last_commanded
-        if abs(rate_change_desired) / time_since_last > self._accel_limit:
-            rate_change_clamped = clamp(rate_change_desired, self._accel_limit * time_since_last)
-            return rate_last_commanded + rate_change_clamped
+        if rate_change_desired > rate_change_limit:
+            return rate_last_commanded + rate_change_limit
+        if rate_change_desired < -rate_change_limit:
+            return rate_last_commanded - rate_change_limit
 
         return rate_desired
 
 
     def _apply_rate_step_limit(self, rate_desired: float, rate_last_commanded: float) -> float:
-        """Apply the slew rate step limit to the desired rate, if enabled.
+        """Apply the slew rate step limit to the desired rate.
+
+        When the limit is disabled the constructor selects _apply_no_limit in place of this method.
 
         Args:
             rate_desired: The desired slew rate in degrees per second.
@@ -818,20 +1029,38 @@ class Gemini2(object):
 
         Returns:
             A slew rate that is within the rate step limit of the last commanded rate. If the
-            rate_desired is already within this limit, or if the limit is disabled, rate_desired
-            is returned unmodified. Otherwise the closest rate that complies with the limit is
-            returned.
+            rate_desired is already within this limit rate_desired is returned unmodified.
+            Otherwise the closest rate that complies with the limit is returned.
         """
-        if self._rate_step_limit is None:
-            return rate_desired
-
         rate_change_desired = rate_desired - rate_last_commanded
-        if abs(rate_change_desired) > self._rate_step_limit:
-            rate_change_clamped = clamp(rate_change_desired, self._rate_step_limit)
-            return rate_last_commanded + rate_change_clamped
+        if rate_change_desired > self._rate_step_limit:
+            return rate_last_commanded + self._rate_step_limit
+        if rate_change_desired < -self._rate_step_limit:
+            return rate_last_commanded - self._rate_step_limit
+
+        return rate_desired
+
 
+    @staticmethod
+    def _apply_no_limit(rate_desired: float, *args) -> float:
+        """Stands in for _apply_rate_accel_limit or _apply_rate_step_limit when disabled.
+
+        Args:
+            rate_desired: The desired slew rate in degrees per second.
+            args: The remaining arguments of the limit method being replaced, which are ignored.
+
+        Returns:
+            rate_desired, unmodified.
+        """
         return rate_desired
 
+    # The limits applied by _slew_rate_single() and the slew rate process. These are class
+    # attributes, rather than bound methods stored on the instance, so that they do not create a
+    # reference cycle that would delay __del__; the constructor overrides them on the instance
+    # with _apply_no_limit for limits that are disabled.
+    _rate_accel_limiter = _apply_rate_accel_limit
+    _rate_step_limiter = _apply_rate_step_limit
+
 
     def _set_divisor(self, axis: str, div: int, div_last_commanded: Optional[int] = None):
         """Set the divisor value for one mount axis to control slew rate.
@@ -841,29 +1070,80 @@ class Gemini2(object):
         Args:
             axis: 'ra' or 'dec'
             div: Divisor value to set
-            div_last_commanded: For RA axis, this is used to avoid sending stop/start movement
-                commands if they are not necessary.
+            div_last_commanded: No commands are sent if this is equal to a non-zero div, since the
+                mount is already running at that divisor. Commands to stop (div of 0) are always
+                sent. For RA axis, this is also used to avoid sending start movement commands if
+                they are not necessary.
         """
+        cmds = self._divisor_commands(axis, div, div_last_commanded)
+        if cmds:
+            self.exec_cmds(*cmds)
+
+
+    @staticmethod
+    def _divisor_commands(
+            axis: str,
+            div: int,
+            div_last_commanded: Optional[int] = None
+        ) -> List[Gemini2Command]:
+        """Build the commands that set the divisor value for one mount axis.
+
+        This allows the commands for both axes to be sent together. See _set_divisor() for the
+        meaning of the arguments.
+
+        Returns:
+            The commands to send, in order. This may be empty.
+        """
+        # A stop is always sent: without multiprocessing the initial last-commanded divisor of 0 is
+        # an assumption rather than the known state of the mount, which may already be moving.
+        if div != 0 and div == div_last_commanded:
+            return []
+
         if axis == 'ra':
+            cmds = []
             # Must use the start and stop movement commands on the RA axis because achieving zero
             # motion when slew() is called repeatedly with a rate of zero can't be accomplished
             # using set_ra_divisor alone.
-            if div == 0 and (div_last_commanded is None or div_last_commanded != 0):
-                self.ra_stop_movement()
-            elif div != 0 and (div_last_commanded is None or div_last_commanded == 0):
-                self.ra_start_movement()
+            if div == 0:
+                cmds.append(G2Cmd_RA_StartStop_Set(G2Stopped.STOPPED))
+            elif div_last_commanded is None or div_last_commanded == 0:
+                cmds.append(G2Cmd_RA_StartStop_Set(G2Stopped.NOT_STOPPED))
 
             # Only set the RA divisor to non-zero values. Setting the RA divisor to 0 will cause
             # that axis to advance by exactly one servo step per command which is not the desired
             # action.
             if div != 0:
                 # the divisor is negated here to reverse the direction
-                self.set_ra_divisor(-div)
-        else:
-            self.set_dec_divisor(div)
+                cmds.append(G2Cmd_RA_Divisor_Set(-div))
+            return cmds
+
+        return [G2Cmd_DEC_Divisor_Set(div)]
+
+
+    @staticmethod
+    def _quantize_rate(rate: float) -> Tuple[int, float]:
+        """Convert a slew rate to the nearest divisor setting and the rate it actually produces.
+
+        Equivalent to slew_rate_to_div() followed by div_to_slew_rate(), for callers that need
+        both values.
+
+        Args:
+            rate: Slew rate in degrees per second.
+
+        Returns:
+            A tuple containing the divisor setting and the corresponding slew rate in degrees per
+            second.
+        """
+        if rate == 0.0:
+            return 0, 0.0
+        div = round(_DIV_RATE_PRODUCT / rate)
+        if div == 0:
+            return 0, 0.0
+        return div, _DIV_RATE_PRODUCT / div
 
 
-    def slew_rate_to_div(self, rate: float) -> int:
+    @staticmethod
+    def slew_rate_to_div(rate: float) -> int:
         """Convert a slew rate to divisor setting.
 
         Args:
@@ -874,11 +1154,13 @@ class Gemini2(object):
         """
         if rate == 0.0:
             return 0
-        # TODO: Replace hard-coded constants with values read from Gemini in constructor
-        return int(12e6 / (6400.0 * rate))
+        # Rounding rather than truncating makes this the exact inverse of div_to_slew_rate; with
+        # truncation a rate computed from a divisor could map back to the next smaller divisor.
+        return round(_DIV_RATE_PRODUCT / rate)
 
 
-    def div_to_slew_rate(self, div: int) -> float:
+    @staticmethod
+    def div_to_slew_rate(div: int) -> float:
         """Convert a divisor setting to corresponding slew rate.
 
         Args:
@@ -889,8 +1171,7 @@ class Gemini2(object):
         """
         if div == 0:
             return 0.0
-        # TODO: Replace hard-coded constants with values read from Gemini in constructor
-        return 12e6 / (6400.0 * div)
+        return _DIV_RATE_PRODUCT / div
 
 
     def stop_motion(self):
@@ -902,24 +1183,59 @@ class Gemini2(object):
         There is a possibility of a race condition here with multiprocessing enabled due to nuances
         of multiprocess communication. If the "safe" events are already set when this is called,
         but the process is just about to send commands to a non-zero slew rate (from previous calls
-        to slew() that are sitting in the pipe), this method could return immediately even though
-        the mount is about to be (briefly) in motion. However this edge case is expected to be
-        relatively unlikely to happen in practice.
+        to slew() not yet picked up by the process), this method could return immediately even
+        though the mount is about to be (briefly) in motion. However this edge case is expected to
+        be relatively unlikely to happen in practice.
+
+        Raises:
+            Gemini2Exception: With multiprocessing enabled, if the slew rate process exits before
+                both axes have stopped. The state of the mount is unknown in that case.
         """
-        if self._use_multiprocessing == True:
-            self.slew('ra', 0.0)
-            self.slew('dec', 0.0)
-            self._axis_safe_event['ra'].wait()
-            self._axis_safe_event['dec'].wait()
+        if self._use_multiprocessing:
+            self.slew_both(0.0, 0.0)
+            # Wait in slices so that a slew rate process that has died, and therefore will never
+            # set these events, is noticed rather than blocking here forever.
+            for axis in ['ra', 'dec']:
+                while not self._axis_safe_event[axis].wait(self._SAFE_EVENT_CHECK_INTERVAL):
+                    if not self._slew_rate_process_handle.is_alive():
+                        raise Gemini2Exception(
+                            'slew rate process exited before motion was stopped'
+                        )
         else:
+            slew_both = self.slew_both
+            # Commands are paced against a fixed schedule rather than sent back-to-back, since
+            # the acceleration limit only allows a small rate change per command anyway.
+            time_next_command = time.perf_counter()
+            time_last_error_report = -math.inf
+            errors_not_reported = 0
             while True:
                 try:
-                    (actual_rate_ra, limits_exceeded) = self.slew('ra', 0.0)
-                    (actual_rate_dec, limits_exceeded) = self.slew('dec', 0.0)
+                    (actual_rate_ra, _), (actual_rate_dec, _) = slew_both(0.0, 0.0)
                 except Gemini2Exception as e:
                     # dangerous to give up because this is critical for stopping mount motion
                     # safely; better to keep trying to send commands to the bitter end
-                    print(f'Ignoring exception in stop_motion: {str(e)}')
-                    continue
-                if actual_rate_ra == 0.0 and actual_rate_dec == 0.0:
-                    return
+                    # (reports are throttled so that a burst of errors does not slow the retries)
+                    time_current = time.perf_counter()
+                    if time_current - time_last_error_report >= self._ERROR_REPORT_INTERVAL:
+                        suppressed = (
+                            f' ({errors_not_reported} similar suppressed)'
+                            if errors_not_reported else ''
+                        )
+                        print(f'Ignoring exception in stop_motion: {str(e)}{suppressed}')
+                        time_last_error_report = time_current
+                        errors_not_reported = 0
+                    else:
+                        errors_not_reported += 1
+                else:
+                    if actual_rate_ra == 0.0 and actual_rate_dec == 0.0:
+                        return
+                # Retries after a failure are paced too, so that a backend that fails immediately
+                # does not turn this into a busy loop flooding the link.
+                time_next_command += self._SLEW_COMMAND_PERIOD
+                time_remaining = time_next_command - time.perf_counter()
+                if time_remaining > 0:
+                    time.sleep(time_remaining)
+                else:
+                    # behind schedule, e.g. after a command that failed slowly; start the schedule
+                    # over rather than sending a burst of commands to catch up
+                    time_next_command = time.perf_counter()
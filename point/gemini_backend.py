@@ -10,6 +10,10 @@ import point.gemini_commands
 from point.gemini_exceptions import *
 
 
+# sequence number / last sequence number header that starts every UDP datagram
+_UDP_HEADER = struct.Struct('!II')
+
+
 class Gemini2Backend(ABC):
     @abstractmethod
     def execute_one_command(self, cmd):
@@ -34,7 +38,29 @@ class Gemini2BackendSerial(Gemini2Backend):
         self._serial = serial.Serial(devname, timeout=self._timeout)
         self._serial.reset_input_buffer()
 
+        # the port is inherited by the Gemini2 slew rate process, so commands from that process and
+        # from the main process must not be interleaved on the wire
+        self._command_lock = multiprocessing.Lock()
+
     def execute_one_command(self, cmd):
+        self._command_lock.acquire()
+        try:
+            resp = self._execute_one_command(cmd)
+        finally:
+            self._command_lock.release()
+        return resp
+
+    # emulated by executing each command one at a time, since responses such as the possibly-zero-
+    # length ones can only be delimited by interleaving extra commands between them
+    def execute_multiple_commands(self, *cmds):
+        self._command_lock.acquire()
+        try:
+            resps = [self._execute_one_command(cmd) for cmd in cmds]
+        finally:
+            self._command_lock.release()
+        return resps
+
+    def _execute_one_command(self, cmd):
         if not cmd.valid_for_serial():
             raise G2BackendCommandNotSupportedError('command {:s} is not supported on the serial backend'.format(cmd.__class__.__name__))
 
@@ -62,11 +88,6 @@ class Gemini2BackendSerial(Gemini2Backend):
             raise G2BackendResponseError('response was decoded, but only {:d} of the {:d} available characters were consumed'.format(len_consumed, len(buf_resp)))
         return resp
 
-    # TODO: maybe emulate this functionality by calling execute_one_command for each cmd one at a
-    # time, and then bundle up the responses and return them...?
-    def execute_multiple_commands(self, *cmds):
-        raise G2BackendFeatureNotSupportedError('executing multiple commands at once is unsupported via the serial backend')
-
     def _wait_for_response(self, resp):
         if resp.decoder().type() == self.DecoderType.FIXED_LENGTH:
             return self._wait_for_response_fixed_length(resp.decoder())
@@ -92,27 +113,19 @@ class Gemini2BackendSerial(Gemini2Backend):
         return buf_resp
 
     def _wait_for_response_hash_terminated(self, decoder):
-        buf_resp = ''
-        while not (len(buf_resp) >= 1 and buf_resp[-1] == '#'):
-            buf_resp += self._get_char()
-        return buf_resp
+        return self._get_chars_until('#')
 
     def _wait_for_response_semicolon_delimited(self, decoder):
-        buf_resp = ''
-        field_count = 0
-        while field_count < decoder.num_fields():
-            buf_resp += self._get_char()
-            if buf_resp[-1] == ';':
-                field_count += 1
+        buf_resp = ''.join(self._get_chars_until(';') for _ in range(decoder.num_fields()))
         if '#' in buf_resp:
             raise G2BackendResponseError('received \'#\' terminator as part of a semicolon-delimited response')
         return buf_resp
 
-    def _get_char(self):
-        char = self._serial.read(1).decode(self._str_encoding())
-        if not char:
+    def _get_chars_until(self, terminator):
+        chars = self._serial.read_until(terminator.encode(self._str_encoding())).decode(self._str_encoding())
+        if chars[-1:] != terminator:
             raise G2BackendReadTimeoutError()
-        return char
+        return chars
 
     def _get_chars(self, count):
         chars = self._serial.read(count).decode(self._str_encoding())
@@ -162,19 +175,58 @@ class Gemini2BackendUDP(Gemini2Backend):
     def execute_one_command(self, cmd):
         self._command_lock.acquire()
         try:
-            resp = self._execute_one_command(cmd)
+            resp = self._execute_commands((cmd,))[0]
         finally:
             self._command_lock.release()
         return resp
 
-    def _execute_one_command(self, cmd):
-        if not cmd.valid_for_udp():
-            raise G2BackendCommandNotSupportedError('command {:s} is not supported on the UDP backend'.format(cmd.__class__.__name__))
+    # all of the commands are sent in a single datagram, and their responses are decoded in order
+    # from the single response datagram
+    def execute_multiple_commands(self, *cmds):
+        self._command_lock.acquire()
+        try:
+            resps = self._execute_commands(cmds)
+        finally:
+            self._command_lock.release()
+        return resps
+
+    def _execute_commands(self, cmds):
+        for cmd in cmds:
+            if not cmd.valid_for_udp():
+                raise G2BackendCommandNotSupportedError('command {:s} is not supported on the UDP backend'.format(cmd.__class__.__name__))
 
-        cmd_str = cmd.encode()
+        resps = [cmd.response() for cmd in cmds]
+
+        # a possibly-zero-length response can't be delimited from the responses that follow it
+        if len(cmds) > 1 and any(resp is not None and resp.decoder().zero_len_hack() for resp in resps):
+            raise G2BackendFeatureNotSupportedError('commands with possibly-zero-length responses cannot be combined with other commands')
+
+        cmd_str = ''.join(cmd.encode() for cmd in cmds)
         if len(cmd_str) > self.UDP_CMD_STR_LEN_MAX:
             raise G2BackendCommandError('command string is too long: {:d} > {:d}'.format(len(cmd_str), self.UDP_CMD_STR_LEN_MAX))
 
+        buf_resp = self._synchronously_send_and_recv(cmd_str)
+
+        if len(buf_resp) == 1 and buf_resp[0] == '\x06':
+            for cmd, resp in zip(cmds, resps):
+                if not resp is None:
+                    raise G2BackendResponseError('received ACK (no response), but command {:s} expected to receive response {:s}'.format(cmd.__class__.__name__, resp.__class__.__name__))
+        else:
+            if all(resp is None for resp in resps):
+                raise G2BackendResponseError('received a response of some kind, but command {:s} was expecting no response'.format(', '.join(cmd.__class__.__name__ for cmd in cmds)))
+            len_consumed = 0
+            for resp in resps:
+                if not resp is None:
+                    len_consumed += resp.decode(buf_resp[len_consumed:])
+            if len_consumed != len(buf_resp):
+                raise G2BackendResponseError('response was decoded, but only {:d} of the {:d} available characters were consumed'.format(len_consumed, len(buf_resp)))
+
+        self._stats['cmd_exec'] += len(cmds)
+        return resps
+
+    # sends a string of one or more commands in a single datagram, handling sequence numbers and
+    # NACK recovery, and returns the response string with the NULL terminator removed
+    def _synchronously_send_and_recv(self, chars):
         # if we get a response that references an earlier seqnum, it's from an earlier command and
         # we can freely discard and ignore it
         min_seqnum = self._seqnum
@@ -189,8 +241,8 @@ class Gemini2BackendUDP(Gemini2Backend):
             if not skip_send:
                 cmd_seqnum = self._seqnum
 
-                buf_cmd = struct.pack('!II', cmd_seqnum, 0)
-                buf_cmd += (cmd_str).encode(self._str_encoding())
+                buf_cmd = _UDP_HEADER.pack(cmd_seqnum, 0)
+                buf_cmd += (chars).encode(self._str_encoding())
                 buf_cmd += b'\x00'
 
                 self._sock.sendto(buf_cmd, self._remote_addr)
@@ -230,7 +282,7 @@ class Gemini2BackendUDP(Gemini2Backend):
             elif len(buf_resp) < self.UDP_RESP_DGRAM_LEN_MIN:
                 raise G2BackendResponseError('received UDP response datagram smaller than min length: {:d} < {:d}'.format(len(buf_resp), self.UDP_RESP_DGRAM_LEN_MIN))
 
-            (seqnum, last_seqnum) = struct.unpack('!II', buf_resp[0:8])
+            (seqnum, last_seqnum) = _UDP_HEADER.unpack_from(buf_resp)
 
             # this is a mess...
             if seqnum != self._seqnum:
@@ -265,28 +317,7 @@ class Gemini2BackendUDP(Gemini2Backend):
                 raise G2BackendResponseError('received UDP response buffer of length {:d} with single NULL terminator at non-end index {:d}'.format(len(buf_resp), string.rfind(buf_resp, '\x00')))
             buf_resp = buf_resp[:-1]
 
-            resp = cmd.response()
-            if len(buf_resp) == 1 and buf_resp[0] == '\x06':
-                if not resp is None:
-                    raise G2BackendResponseError('received ACK (no response), but command {:s} expected to receive response {:s}'.format(cmd.__class__.__name__, resp.__class__.__name__))
-            else:
-                if resp is None:
-                    raise G2BackendResponseError('received a response of some kind, but command {:s} was expecting no response'.format(cmd.__class__.__name__))
-                len_consumed = resp.decode(buf_resp)
-                if len_consumed != len(buf_resp):
-                    raise G2BackendResponseError('response was decoded, but only {:d} of the {:d} available characters were consumed'.format(len_consumed, len(buf_resp)))
-
-            self._stats['cmd_exec'] += 1
-            return resp
-
-    def execute_multiple_commands(self, *cmds):
-        # TODO: implement this!
-        raise G2BackendFeatureNotImplementedYetError('TODO')
-
-    def _synchronously_send_and_recv(self, chars):
-        # TODO: use this as the underlying function for the bulk of the common datagram handling
-        # stuff in both execute_one_command and execute_multiple_commands
-        raise G2BackendFeatureNotImplementedYetError('TODO')
+            return buf_resp
 
     def get_statistic(self, key):
         return self._stats[key]
@@ -20,6 +20,7 @@ _re_ang_high  = re.compile(r'^([-+]?)(\d{1,2}):(\d{1,2}):(\d{1,2})$',       re.A
 _re_ang_low   = re.compile(r'^([-+]?)(\d{1,3})' + '\xDF' + r'(\d{1,2})$',   re.ASCII)
 _re_time_dbl  = re.compile(r'^([-+]?)(\d+\.\d{6})$',                        re.ASCII)
 _re_time_hilo = re.compile(r'^(\d{1,2}):(\d{1,2}):(\d{1,2})$',              re.ASCII)
+_re_date      = re.compile(r'^\d{2}/\d{2}/\d{2}$',                            re.ASCII)
 _re_revisions = re.compile(r'^.{8}$',                                       re.ASCII)
 _re_ipv4addr  = re.compile(r'^(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})$', re.ASCII)
 
@@ -648,6 +649,22 @@ class G2Rsp_SyncToObject(Gemini2Response_LX200):
 
 ### Get Information Commands
 
+class G2Cmd_GetDate(Gemini2Command_LX200):
+    def lx200_str(self): return 'GC'
+    def response(self):  return G2Rsp_GetDate(self)
+class G2Rsp_GetDate(Gemini2Response_LX200):
+    def interpret(self):
+        if _re_date.fullmatch(self.get_raw()) is None:
+            raise G2ResponseParseError(f'failed to parse \'{self.get_raw():s}\' as date')
+    def get(self): return self.get_raw() # 'MM/DD/YY'
+
+class G2Cmd_GetTime(Gemini2Command_LX200):
+    def lx200_str(self): return 'GL'
+    def response(self):  return G2Rsp_GetTime(self)
+class G2Rsp_GetTime(Gemini2Response_LX200):
+    def interpret(self): self._hours = parse_time_dbl(self.get_raw()) # raises G2ResponseTimeParseError on failure
+    def get(self):       return self._hours
+
 # ...
 
 
@@ -8,13 +8,35 @@ import time
 
 
 def latency_test(cmd_function, cmd_args, num_trials):
-    measurements = []
+    # Monotonic integer nanosecond timestamps, stored in a preallocated array so that nothing but
+    # the command itself happens inside the timed region.
+    perf_counter_ns = time.perf_counter_ns
+    measurements = np.empty(num_trials, dtype=np.int64)
     for i in range(num_trials):
-        time_start = time.time()
+        time_start = perf_counter_ns()
         cmd_function(*cmd_args)
-        measurements.append((time.time() - time_start) * 1000)
-    print('Mean: ' + str(np.mean(measurements)) + ' ms')
-    print('Standard deviation: ' + str(np.std(measurements)) + ' ms')
+        measurements[i] = perf_counter_ns() - time_start
+    measurements_ms = measurements / 1e6
+    print('Mean: ' + str(np.mean(measurements_ms)) + ' ms')
+    print('Standard deviation: ' + str(np.std(measurements_ms)) + ' ms')
+
+def pipelined_latency_test(mount, command, response_len, num_trials):
+    # Keep one command in flight ahead of the response being read, such that the serial link is
+    # busy in both directions. Each measurement is the interval between successive responses.
+    perf_counter_ns = time.perf_counter_ns
+    measurements = np.empty(num_trials, dtype=np.int64)
+    mount.submit(command, response_len)
+    time_start = perf_counter_ns()
+    for i in range(num_trials):
+        if i + 1 < num_trials:
+            mount.submit(command, response_len)
+        mount.reap()
+        time_end = perf_counter_ns()
+        measurements[i] = time_end - time_start
+        time_start = time_end
+    measurements_ms = measurements / 1e6
+    print('Mean: ' + str(np.mean(measurements_ms)) + ' ms')
+    print('Standard deviation: ' + str(np.std(measurements_ms)) + ' ms')
 
 def main():
 
@@ -29,16 +51,40 @@ def main():
         help='serial device node or hostname for mount command interface',
         default='/dev/ttyACM0'
     )
+    parser.add_argument(
+        '--baudrate',
+        help='serial baud rate (nexstar only)',
+        type=int,
+        default=9600
+    )
+    parser.add_argument(
+        '--low-latency',
+        help='set ASYNC_LOW_LATENCY on the serial device (nexstar only, Linux only)',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--select-read',
+        help='read responses with select() and os.read() (nexstar only, POSIX only)',
+        action='store_true'
+    )
     args = parser.parse_args()
 
     NUM_TRIALS_PER_COMMAND = 1000
 
     if args.mount_type == 'nexstar':
-        mount = nexstar.NexStar(args.mount_path)
+        mount = point.NexStar(
+            args.mount_path,
+            baudrate=args.baudrate,
+            low_latency=args.low_latency,
+            select_read=args.select_read,
+        )
 
         print('Testing get_azalt command latency...')
         latency_test(mount.get_azalt, [], NUM_TRIALS_PER_COMMAND)
 
+        print('Testing pipelined get_azalt command latency...')
+        pipelined_latency_test(mount, b'z', 17, NUM_TRIALS_PER_COMMAND)
+
         print('Testing slew_var command latency...')
         latency_test(mount.slew_var, ['az', 0.0], NUM_TRIALS_PER_COMMAND)
 
@@ -1,19 +1,97 @@
 """NexStar hand controller command API.
 
-Contains a single class NexStar which provides an API for the NexStar hand controller command set.
-The serial command protocol is documented here:
+Contains a class NexStar which provides an API for the NexStar hand controller command set, and a
+class AsyncNexStar which exposes the same API as coroutines for use with asyncio. The serial command
+protocol is documented here:
 http://www.nexstarsite.com/download/manuals/NexStarCommunicationProtocolV1.2.zip
 """
+# pylint: disable=too-many-lines
 
 
-import datetime
+import asyncio
+import binascii
+import collections
+import functools
 import calendar
+import os
+import select
+import struct
+import sys
+import time
 import serial
 
 
-__all__ = ['NexStar']
+__all__ = ['NexStar', 'AsyncNexStar']
 
-# pylint: disable=too-many-public-methods
+# Motor controller device IDs addressed by the 'P' pass-through slew commands
+_SLEW_AXIS_DEVICE = {'az': 16, 'ra': 16, 'alt': 17, 'dec': 17}
+
+# Layout of the 'P' pass-through commands: the command char followed by the message length, device
+# ID, message ID, three data bytes, and the number of response bytes expected
+_PASS_THROUGH_STRUCT = struct.Struct('>c7B')
+
+# Eight single-byte fields of the location ('w'/'W') and time ('h'/'H') commands. The set
+# variants are prefixed by the command character.
+_LOCATION_STRUCT = _TIME_STRUCT = struct.Struct('8B')
+_SET_LOCATION_STRUCT = _SET_TIME_STRUCT = struct.Struct('c8B')
+
+# GPS queries sent as 'P' pass-through commands to device 176
+_GPS_LATITUDE_COMMAND = _PASS_THROUGH_STRUCT.pack(b'P', 1, 176, 1, 0, 0, 0, 3)
+_GPS_LONGITUDE_COMMAND = _PASS_THROUGH_STRUCT.pack(b'P', 1, 176, 2, 0, 0, 0, 3)
+_GPS_YEAR_COMMAND = _PASS_THROUGH_STRUCT.pack(b'P', 1, 176, 4, 0, 0, 0, 2)
+_GPS_DATE_COMMAND = _PASS_THROUGH_STRUCT.pack(b'P', 1, 176, 3, 0, 0, 0, 2)
+_GPS_TIME_COMMAND = _PASS_THROUGH_STRUCT.pack(b'P', 1, 176, 51, 0, 0, 0, 3)
+_GPS_LOCK_STATUS_COMMAND = _PASS_THROUGH_STRUCT.pack(b'P', 1, 176, 55, 0, 0, 0, 1)
+
+# Valid command characters for _get_position and _goto
+_POSITION_COMMAND_CHARS = frozenset((b'e', b'z'))
+_GOTO_COMMAND_CHARS = frozenset((b'b', b'r', b's'))
+
+# Axes accepted by the fixed-rate slew commands
+_SLEW_FIXED_AXES = frozenset(('az', 'alt'))
+
+# Valid tracking mode values for the 'T' command
+_TRACKING_MODES = range(4)
+
+# Number of past GOTO durations kept for choosing the wait_for_goto polling schedule
+_GOTO_HISTORY_LEN = 100
+
+# Minimum number of past GOTO durations needed before wait_for_goto uses them to schedule polls
+_GOTO_HISTORY_MIN_SAMPLES = 10
+
+# Default backoff between polls in seconds used by wait_for_goto when too little history exists,
+# or once a GOTO has outlasted the history-based schedule
+_GOTO_POLL_INITIAL_INTERVAL = 0.05
+_GOTO_POLL_MAX_INTERVAL = 0.5
+
+# Scale factors between degrees and the 32-bit NexStar precise angle format
+_DEG_TO_PRECISE = 2.**32 / 360.
+_PRECISE_TO_DEG = 360. / 2.**32
+
+# Pair of big-endian 32-bit angles decoded from a position response in precise format
+_POSITION_STRUCT = struct.Struct('>II')
+
+# Linux serial driver flag (from linux/serial.h) that requests minimal receive latency. For FTDI
+# USB-serial adapters this reduces the latency timer from its 16 ms default to 1 ms.
+_ASYNC_LOW_LATENCY = 0x2000
+
+# Byte offset of the int flags field in the Linux struct serial_struct, following the type, line,
+# port, and irq fields
+_SERIAL_STRUCT_FLAGS_OFFSET = 16
+
+# Buffer size used for the TIOCGSERIAL/TIOCSSERIAL ioctls; larger than struct serial_struct
+_SERIAL_STRUCT_BUF_SIZE = 0x60
+
+@functools.lru_cache(maxsize=256)
+def _precise_hex(value):
+    """Formats a 32-bit integer as the 8 hex digits of the NexStar precise angle format.
+
+    Cached since scripted GOTOs and syncs often repeat the same coordinates.
+    """
+    return b'%08X' % value
+
+
+# pylint: disable=too-many-public-methods,too-many-instance-attributes
 class NexStar:
     """Implements the serial commands used by NexStar telescope mount hand controllers."""
 
@@ -33,24 +111,131 @@ class NexStar:
     class ReadTimeoutException(Exception):
         """Raised when read from NexStar times out."""
 
-    def __init__(self, device, read_timeout=3.5):
+    # Fixed single-character commands
+    _CMD_GET_TRACKING_MODE = b't'
+    _CMD_GET_VERSION = b'V'
+    _CMD_GET_MODEL = b'm'
+    _CMD_ALIGNMENT_COMPLETE = b'J'
+    _CMD_GOTO_IN_PROGRESS = b'L'
+    _CMD_CANCEL_GOTO = b'M'
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+            self,
+            device,
+            read_timeout=3.5,
+            baudrate=9600,
+            low_latency=False,
+            select_read=False,
+            response_slack=None,
+        ):
         """Constructs a NexStar object.
 
         Args:
             device (str): The path to the serial device connected to the NexStar hand controller.
                 For example, '/dev/ttyUSB0'.
             read_timeout (float): Timeout in seconds for reads on the serial device.
+            baudrate (int): Baud rate of the serial device. NexStar hand controllers use 9600 baud
+                by default. Only change this if the hand controller or an adapter between it and
+                this machine is configured to use a different rate.
+            low_latency (bool): If True, set the ASYNC_LOW_LATENCY flag on the serial device. This
+                is only supported on Linux and is mainly useful with FTDI USB-serial adapters,
+                where it removes up to 16 ms of latency from every command response.
+            select_read (bool): If True, read responses by waiting on the serial file descriptor
+                with select() and calling os.read() directly rather than using the blocking reads
+                of the serial package. Requires a POSIX system.
+            response_slack (float): If set, reads of responses with a known length time out after
+                the time needed to transmit the response at the configured baud rate plus this many
+                seconds, rather than after read_timeout. This makes a lost or garbled response fail
+                quickly. The slack must cover the time the hand controller takes to process each
+                command, so keep it generous (tens of milliseconds or more).
         """
-        self.serial = serial.Serial(device, baudrate=9600, timeout=read_timeout)
+        self.serial = serial.Serial(device, baudrate=baudrate, timeout=read_timeout)
+        self._read_timeout = read_timeout
+        self._response_slack = response_slack
+        # 10 bits per character: start bit, 8 data bits, stop bit
+        self._seconds_per_char = 10. / baudrate
+
+        # Bytes read from the device by _select_read_until() but not yet consumed
+        self._rx_buffer = bytearray()
+        self._read_until = self._select_read_until if select_read else self.serial.read_until
+
+        # Expected response lengths of commands sent with submit() that have not been reaped yet
+        self._pending_response_lens = collections.deque()
+
+        # Reusable command buffer for slew_var
+        self._slew_var_buffer = bytearray(_PASS_THROUGH_STRUCT.size)
+
+        # Observed durations of recent GOTOs in seconds and the start time of the latest one
+        self._goto_durations = collections.deque(maxlen=_GOTO_HISTORY_LEN)
+        self._goto_start_time = None
+
+        # Done last since it can fail, after which __del__ still needs the state above to close()
+        if low_latency:
+            self._set_low_latency()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def __del__(self):
         """Destructs a NexStar object.
 
-        Any GOTO in progress will be cancelled and any active slewing will be stopped.
+        Calls close() in case it was not called explicitly, such that the mount is not left
+        slewing. Prefer calling close() or using the object as a context manager, since the timing
+        of finalization is not deterministic and the serial port may already be unusable by then.
+        """
+        if hasattr(self, 'serial'):
+            self.close()
+
+    def close(self):
+        """Stops the mount and closes the serial port.
+
+        Any GOTO in progress will be cancelled and any active slewing will be stopped. Errors
+        communicating with the hand controller while doing so are ignored such that the port is
+        always closed. Responses to any submitted commands that have not been reaped are
+        abandoned. Calling this more than once has no further effect.
         """
-        self.cancel_goto()
-        self.slew_fixed('az', 0)
-        self.slew_fixed('alt', 0)
+        if not self.serial.is_open:
+            return
+        # the stop commands below must not be refused because of unreaped submits; with nothing
+        # pending, submit() also discards any of their responses that have already arrived
+        self._pending_response_lens.clear()
+        try:
+            self.cancel_goto()
+            self.request_many([
+                (self._slew_fixed_command('az', 0), None),
+                (self._slew_fixed_command('alt', 0), None),
+            ])
+        except (serial.SerialException, NexStar.ReadTimeoutException, NexStar.ResponseException):
+            pass
+        finally:
+            self._pending_response_lens.clear()
+            self.serial.close()
+
+    def _set_low_latency(self):
+        """Sets the ASYNC_LOW_LATENCY flag on the serial device.
+
+        Raises:
+            NotImplementedError: When not running on Linux.
+            OSError: When the serial driver does not support the ioctls used.
+        """
+        if not sys.platform.startswith('linux'):
+            raise NotImplementedError('low_latency is only supported on Linux')
+
+        # pylint: disable=import-outside-toplevel
+        import fcntl
+        import termios
+
+        fd = self.serial.fileno()
+        serial_struct = bytearray(
+            fcntl.ioctl(fd, termios.TIOCGSERIAL, bytes(_SERIAL_STRUCT_BUF_SIZE))
+        )
+        flags, = struct.unpack_from('i', serial_struct, _SERIAL_STRUCT_FLAGS_OFFSET)
+        flags |= _ASYNC_LOW_LATENCY
+        struct.pack_into('i', serial_struct, _SERIAL_STRUCT_FLAGS_OFFSET, flags)
+        fcntl.ioctl(fd, termios.TIOCSSERIAL, bytes(serial_struct))
 
     def _send_command(self, command, response_len=None):
         """Sends a command to the NexStar hand controller and reads back the response.
@@ -72,15 +257,169 @@ class NexStar:
             ResponseException: When the response length does not match the value of the
                 response_len argument.
         """
+        assert not self._pending_response_lens, 'reap() all submitted commands first'
+        self.submit(command, response_len)
+        return self.reap()
+
+    def request_many(self, commands):
+        """Sends several commands to the hand controller in a single write.
+
+        The hand controller processes the commands in order and replies to each in turn, so all of
+        the responses are read back after the combined write. This saves a serial round-trip per
+        additional command compared to sending each one separately.
+
+        Args:
+            commands (list): A list of (command, response_len) tuples. The command is the raw bytes
+                to send and response_len is the expected length of the response to it, not
+                counting the terminating '#' character, or None to skip length validation.
+
+        Returns:
+            list of byte arrays: The responses to each command in the same order as the commands,
+            excluding the termination characters.
+
+        Raises:
+            ReadTimeoutException: When a timeout occurs during the attempt to read from the serial
+                device.
+            ResponseException: When the length of a response does not match the corresponding
+                response_len.
+        """
+        assert not self._pending_response_lens, 'reap() all submitted commands first'
+        self._discard_stale_input()
+        self.serial.write(b''.join(command for command, _ in commands))
+        self._pending_response_lens.extend(response_len for _, response_len in commands)
+        return [self.reap() for _ in commands]
+
+    def submit(self, command, response_len=None):
+        """Sends a command to the hand controller without waiting for its response.
 
-        # Eliminate any stale data sitting in the read buffer which could be left over from prior
-        # command responses.
-        self.serial.read(self.serial.in_waiting)
+        This allows commands to be pipelined: the next command can be written while the hand
+        controller is still working on the previous one, keeping both directions of the serial
+        link busy. Each call must eventually be matched by one call to reap(), which returns the
+        responses in the order the commands were submitted. The other methods of this class must
+        not be called while any submitted commands have not been reaped.
 
+        Args:
+            command (bytes): The raw command to send.
+            response_len (int): The expected length of the response to this command, not counting
+                the terminating '#' character, or None to skip length validation.
+        """
+        if not self._pending_response_lens:
+            self._discard_stale_input()
         self.serial.write(command)
+        self._pending_response_lens.append(response_len)
+
+    def reap(self):
+        """Reads the response to the oldest command sent with submit() that has not been reaped.
+
+        If an exception is raised, the responses to any other outstanding commands are abandoned
+        since the position of their boundaries in the serial stream can no longer be trusted.
+
+        Returns:
+            bytes: The response from the hand controller, excluding the termination character.
 
-        response = self.serial.read_until(terminator=b'#')
+        Raises:
+            IndexError: When there are no outstanding submitted commands.
+            ReadTimeoutException: When a timeout occurs during the attempt to read from the serial
+                device.
+            ResponseException: When the response length does not match the response_len given
+                to submit().
+        """
+        response_len = self._pending_response_lens.popleft()
+        try:
+            return self._read_response(response_len)
+        except (NexStar.ReadTimeoutException, NexStar.ResponseException):
+            self._pending_response_lens.clear()
+            raise
+
+    def _discard_stale_input(self):
+        """Eliminates any stale data sitting in the read buffer.
+
+        Such data could be left over from prior command responses.
+        """
+        self._rx_buffer.clear()
+        self.serial.reset_input_buffer()
+
+    def _select_read_until(self, terminator, size=None):
+        """Reads from the serial device until a terminator is found, size is reached, or timeout.
+
+        This has the same semantics as the read_until method of the serial package but waits for
+        data with a single select() call per chunk instead of polling. Bytes read beyond the end of
+        the returned data are kept for the next call.
+
+        Args:
+            terminator (bytes): The terminator to search for.
+            size (int): Maximum number of bytes to return, or None for no limit.
+
+        Returns:
+            bytes: The data read, including the terminator if one was found.
+        """
+        buf = self._rx_buffer
+        fd = self.serial.fileno()
+        timeout = self.serial.timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            end = buf.find(terminator)
+            if end >= 0 and (size is None or end < size):
+                end += len(terminator)
+                break
+            if size is not None and len(buf) >= size:
+                end = size
+                break
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.)
+            if not select.select([fd], [], [], remaining)[0]:
+                end = len(buf)
+                break
+            data = os.read(fd, 4096)
+            if not data:
+                raise serial.SerialException(
+                    'device reports readiness to read but returned no data '
+                    '(device disconnected or multiple access on port?)')
+            buf += data
+        response = bytes(buf[:end])
+        del buf[:end]
+        return response
+
+    def _set_read_timeout(self, timeout):
+        """Sets the read timeout of the serial device if it differs from the current value.
+
+        Changing the timeout reconfigures the port, so this is avoided when it is unchanged.
+
+        Args:
+            timeout (float): The new timeout in seconds.
+        """
+        if self.serial.timeout != timeout:
+            self.serial.timeout = timeout
+
+    def _read_response(self, response_len=None):
+        """Reads a single '#'-terminated response from the hand controller.
+
+        Args:
+            response_len: Expected length of the response not counting the terminating '#'
+                character, or None to skip length validation.
+
+        Returns:
+            A byte array containing the response, excluding the termination character.
+
+        Raises:
+            ReadTimeoutException: When a timeout occurs during the attempt to read from the serial
+                device.
+            ResponseException: When the response length does not match response_len. If the
+                response is longer than expected, reading stops after response_len + 1 bytes.
+        """
+        # When the response length is known there is no reason to keep reading past the point
+        # where the terminator should have been; a longer response is invalid regardless.
+        max_len = None if response_len is None else response_len + 1
+        if self._response_slack is not None:
+            self._set_read_timeout(
+                self._read_timeout if max_len is None
+                else max_len * self._seconds_per_char + self._response_slack
+            )
+        response = self._read_until(terminator=b'#', size=max_len)
         if response[-1:] != b'#':
+            if max_len is not None and len(response) == max_len:
+                raise NexStar.ResponseException(
+                    response,
+                    f'Expected response length {response_len:d} but no terminator was found.')
             raise NexStar.ReadTimeoutException()
 
         # strip off the '#' terminator
@@ -91,24 +430,11 @@ class NexStar:
             if len(response) != response_len:
                 raise NexStar.ResponseException(
                     response,
-                    'Expected response length {:d} but got {:d} instead.'.format(response_len,
-                                                                                 len(response)))
+                    f'Expected response length {response_len:d} but got {len(response):d} '
+                    'instead.')
 
         return response
 
-    @staticmethod
-    def _precise_to_degrees(precise):
-        """Decodes angle from a bytearray in NexStar precise format to a float in degrees.
-
-        Args:
-            precise (bytearray): An angle encoded as a string in the precise angle format. See the
-                NexStar command reference for details on this encoding.
-
-        Returns:
-            float: Angle in degrees. Value will be in range [0,360).
-        """
-        return int(precise, 16) / 2.**32 * 360.
-
     @staticmethod
     def _degrees_to_precise(degrees):
         """Encodes angular values as a bytearray in NexStar precise angle format.
@@ -122,7 +448,10 @@ class NexStar:
             for details on this encoding.
 
         """
-        return b'%08X' % round((degrees % 360.) / 360. * 2.**32)
+        # Masking to 32 bits wraps the angle into [0, 360) degrees: negative values become their
+        # two's complement, which is the same as adding 360 degrees, and values at or above 360
+        # degrees (including those just below 360 that round up to 2**32) drop their high bits.
+        return _precise_hex(round(degrees * _DEG_TO_PRECISE) & 0xFFFFFFFF)
 
     def _get_position(self, command_char):
         """Generic "get position" command helper function.
@@ -137,10 +466,31 @@ class NexStar:
             command_char argument.
 
         """
-        assert command_char in [b'e', b'z']
-        response = self._send_command(command_char, 17)
-        return (self._precise_to_degrees(response[0: 8]),
-                self._precise_to_degrees(response[9:17]))
+        assert command_char in _POSITION_COMMAND_CHARS
+        return self._decode_position(self._send_command(command_char, 17))
+
+    @staticmethod
+    def _decode_position(response):
+        """Decodes the response to a "get position" command.
+
+        Args:
+            response (bytes): The response to a precise 'e' or 'z' command, excluding the
+                terminating '#' character.
+
+        Returns:
+            tuple of floats: The pair of angles in the response in degrees.
+
+        Raises:
+            ResponseException: When the response is not a valid precise position.
+        """
+        if response[8:9] != b',':
+            raise NexStar.ResponseException(response, 'Missing separator in position response')
+        try:
+            (first, second) = _POSITION_STRUCT.unpack(
+                binascii.unhexlify(response[:8] + response[9:]))
+        except binascii.Error as e:
+            raise NexStar.ResponseException(response, 'Invalid hex in position response') from e
+        return (first * _PRECISE_TO_DEG, second * _PRECISE_TO_DEG)
 
     def get_azalt(self):
         """Get current mount position in horizontal (azimuth/altitude) coordinates.
@@ -170,23 +520,46 @@ class NexStar:
         """
         return self._get_position(b'e')
 
-    def _goto(self, command_char, values):
+    def get_azalt_radec(self):
+        """Get current mount position in both horizontal and equatorial coordinates.
+
+        Both positions are requested with a single serial write, which is faster than calling
+        get_azalt and get_radec separately. See those methods for details.
+
+        Returns:
+            tuple of tuples of floats: ((azimuth, altitude), (right ascension, declination)) in
+            degrees. Altitude range is [-180,180).
+        """
+        (azalt_response, radec_response) = self.request_many([(b'z', 17), (b'e', 17)])
+        # pylint: disable=invalid-name
+        (az, alt) = self._decode_position(azalt_response)
+        # adjust range of altitude from [0,360) to [-180,180)
+        alt = (alt + 180.0) % 360.0 - 180.0
+        return ((az, alt), self._decode_position(radec_response))
+
+    def _goto(self, command_char, first, second):
         """Generic "goto" command helper function.
 
         Args:
             command_char (bytearray): A single character; 'b' for RA/DEC goto, 'r' for AZ/ALT goto,
                 or 's' for sync. Only the precise version of these commands are supported,
                 therefore 'B', 'R', and 'S' are not allowed.
-            values (tuple of floats): A pair of angles in degrees: (ra, dec) or (az, alt) depending
-                on the command_char argument.
+            first (float): The first angle in degrees: ra or az depending on the command_char
+                argument.
+            second (float): The second angle in degrees: dec or alt depending on the command_char
+                argument.
 
         """
-        assert command_char in [b'b', b'r', b's']
-        command = (command_char
-                   + self._degrees_to_precise(values[0])
-                   + b','
-                   + self._degrees_to_precise(values[1]))
+        assert command_char in _GOTO_COMMAND_CHARS
+        command = b''.join((
+            command_char,
+            self._degrees_to_precise(first),
+            b',',
+            self._degrees_to_precise(second),
+        ))
         self._send_command(command)
+        if command_char != b's':
+            self._goto_start_time = time.monotonic()
 
     def goto_azalt(self, az, alt):
         """Go to a position in horizontal (azimuth/altitude) coordinates.
@@ -196,7 +569,7 @@ class NexStar:
             alt (float): Altitude angle in degrees.
         """
         # pylint: disable=invalid-name
-        self._goto(b'b', (az, alt))
+        self._goto(b'b', az, alt)
 
     def goto_radec(self, ra, dec):
         """Go to a position in equatorial (right ascension/declination) coordinates.
@@ -206,7 +579,7 @@ class NexStar:
             dec (float): Declination angle in degrees.
         """
         # pylint: disable=invalid-name
-        self._goto(b'r', (ra, dec))
+        self._goto(b'r', ra, dec)
 
     def sync(self, ra, dec):
         """Sync mount to a position in equatorial (right ascension/declination) coordinates.
@@ -220,7 +593,7 @@ class NexStar:
             dec (float): Declination angle in degrees.
         """
         # pylint: disable=invalid-name
-        self._goto(b's', (ra, dec))
+        self._goto(b's', ra, dec)
 
     def get_tracking_mode(self):
         """Get the current tracking mode.
@@ -232,8 +605,7 @@ class NexStar:
             2 = EQ North
             3 = EQ South
         """
-        response = self._send_command(b't', 1)
-        return response[0]
+        return self._send_command(self._CMD_GET_TRACKING_MODE, 1)[0]
 
     def set_tracking_mode(self, mode):
         """Set the tracking mode.
@@ -248,10 +620,80 @@ class NexStar:
                 2 = EQ North
                 3 = EQ South
         """
-        assert mode in range(0, 4)
+        if mode not in _TRACKING_MODES:
+            raise ValueError(f'invalid tracking mode {mode!r}')
         command = b'T' + bytes([mode])
         self._send_command(command)
 
+    @staticmethod
+    def _slew_var_command(axis, rate):
+        """Builds a variable-rate slew command.
+
+        Args:
+            axis (str): The mount axis to command: 'az', 'alt', 'ra', or 'dec'.
+            rate (float): The desired slew rate in arcseconds per second.
+
+        Returns:
+            bytes: The encoded command. See slew_var for details.
+        """
+        command = bytearray(_PASS_THROUGH_STRUCT.size)
+        NexStar._pack_slew_var_command(command, axis, rate)
+        return bytes(command)
+
+    @staticmethod
+    def _pack_slew_var_command(buffer, axis, rate):
+        """Encodes a variable-rate slew command into an existing buffer.
+
+        Args:
+            buffer (bytearray): Destination of the encoded command. Must be at least
+                _PASS_THROUGH_STRUCT.size bytes long.
+            axis (str): The mount axis to command: 'az', 'alt', 'ra', or 'dec'.
+            rate (float): The desired slew rate in arcseconds per second.
+        """
+        try:
+            device = _SLEW_AXIS_DEVICE[axis]
+        except KeyError:
+            raise ValueError(f'invalid slew axis {axis!r}') from None
+        rate_magnitude = int(abs(rate)) * 4
+        _PASS_THROUGH_STRUCT.pack_into(
+            buffer,
+            0,
+            b'P',
+            3,  # variable rate slew
+            device,
+            7 if rate < 0 else 6,  # sign of rate
+            rate_magnitude >> 8,  # upper byte of rate magnitude
+            rate_magnitude & 0xFF,  # lower byte of rate magnitude
+            0,
+            0,
+        )
+
+    @staticmethod
+    def _slew_fixed_command(axis, rate):
+        """Builds a fixed-rate slew command.
+
+        Args:
+            axis (str): The mount axis to command: 'az' or 'alt'.
+            rate (int): The desired slew rate from -9 to +9.
+
+        Returns:
+            bytes: The encoded command. See slew_fixed for details.
+        """
+        if axis not in _SLEW_FIXED_AXES:
+            raise ValueError(f'invalid fixed-rate slew axis {axis!r}')
+        if not -9 <= rate <= 9:
+            raise ValueError(f'fixed slew rate {rate} out of range [-9, 9]')
+        return _PASS_THROUGH_STRUCT.pack(
+            b'P',
+            2,  # fixed rate slew
+            _SLEW_AXIS_DEVICE[axis],
+            37 if rate < 0 else 36,  # sign of rate
+            int(abs(rate)),  # rate magnitude
+            0,
+            0,
+            0,
+        )
+
     def slew_var(self, axis, rate):
         """Variable-rate slew command.
 
@@ -266,17 +708,27 @@ class NexStar:
                 the NexStar 130SLT is 3 deg/s. However the maximum commandable rate for the same
                 model was found by experimentation to be 16319 arcseconds per second or ~4.5 deg/s.
         """
-        assert axis in ['az', 'alt', 'ra', 'dec']
-        command = b'P' + bytes([
-            3,  # variable rate slew
-            16 if axis in ['az', 'ra']  else 17,  # axis
-            7 if rate < 0 else 6,  # sign of rate
-            (int(abs(rate)) * 4) // 256,  # upper byte of rate magnitude
-            (int(abs(rate)) * 4) % 256,  # lower byte of rate magnitude
-            0,
-            0,
+        # This is typically called at a high rate from tracking loops, so the command is packed
+        # into a buffer that is reused across calls rather than allocated each time.
+        self._pack_slew_var_command(self._slew_var_buffer, axis, rate)
+        self._send_command(self._slew_var_buffer)
+
+    def slew_var_both(self, az_rate, alt_rate):
+        """Variable-rate slew command for both axes at once.
+
+        Equivalent to calling slew_var for each axis, but both commands are sent to the hand
+        controller in a single serial write which avoids one command round-trip.
+
+        Args:
+            az_rate (float): The desired slew rate for the azimuth (or right ascension) axis in
+                arcseconds per second. See slew_var for details.
+            alt_rate (float): The desired slew rate for the altitude (or declination) axis in
+                arcseconds per second. See slew_var for details.
+        """
+        self.request_many([
+            (self._slew_var_command('az', az_rate), None),
+            (self._slew_var_command('alt', alt_rate), None),
         ])
-        self._send_command(command)
 
     def slew_fixed(self, axis, rate):
         """Fixed-rate slew command.
@@ -289,18 +741,7 @@ class NexStar:
                 'dec' for equatorial mounts.
             rate (int): The desired slew rate from -9 to +9. Use value 0 to stop motion.
         """
-        assert axis in ['az', 'alt']
-        assert -9 <= rate <= 9, 'fixed slew rate out of range'
-        command = b'P' + bytes([
-            2,  # fixed rate slew
-            16 if axis in ['az', 'ra'] else 17,  # axis
-            37 if rate < 0 else 36,  # sign of rate
-            int(abs(rate)),  # rate magnitude
-            0,
-            0,
-            0,
-        ])
-        self._send_command(command)
+        self._send_command(self._slew_fixed_command(axis, rate))
 
     def get_location(self):
         """Get the mount location on Earth in geographic (latitude/longitude) coordinates.
@@ -309,19 +750,13 @@ class NexStar:
             tuple of floats: A pair of angles (latitude, longitude) in signed degrees format.
         """
         response = self._send_command(b'w', 8)
-        lat_deg = response[0]
-        lat_min = response[1]
-        lat_sec = response[2]
-        lat_north = (response[3] == 0)
+        (lat_deg, lat_min, lat_sec, lat_south,
+         lon_deg, lon_min, lon_sec, lon_west) = _LOCATION_STRUCT.unpack(response)
         lat = lat_deg + lat_min / 60.0 + lat_sec / 3600.0
-        if not lat_north:
+        if lat_south:
             lat = -lat
-        lon_deg = response[4]
-        lon_min = response[5]
-        lon_sec = response[6]
-        lon_east = (response[7] == 0)
         lon = lon_deg + lon_min / 60.0 + lon_sec / 3600.0
-        if not lon_east:
+        if lon_west:
             lon = -lon
         return (lat, lon)
 
@@ -332,13 +767,16 @@ class NexStar:
             lat (float): Latitude in signed degrees format.
             lon (float): Longitude in signed degrees format.
         """
-        lat_deg = int(abs(lat))
-        lat_min = int((abs(lat) - lat_deg) * 60.0)
-        lat_sec = int((abs(lat) - lat_deg - lat_min / 60.0) * 3600.0)
-        lon_deg = int(abs(lon))
-        lon_min = int((abs(lon) - lon_deg) * 60.0)
-        lon_sec = int((abs(lon) - lon_deg - lon_min / 60.0) * 3600.0)
-        command = b'W' + bytes([
+        lat_abs = abs(lat)
+        lat_deg = int(lat_abs)
+        lat_min = int((lat_abs - lat_deg) * 60.0)
+        lat_sec = int((lat_abs - lat_deg - lat_min / 60.0) * 3600.0)
+        lon_abs = abs(lon)
+        lon_deg = int(lon_abs)
+        lon_min = int((lon_abs - lon_deg) * 60.0)
+        lon_sec = int((lon_abs - lon_deg - lon_min / 60.0) * 3600.0)
+        command = _SET_LOCATION_STRUCT.pack(
+            b'W',
             lat_deg,
             lat_min,
             lat_sec,
@@ -347,7 +785,7 @@ class NexStar:
             lon_min,
             lon_sec,
             lon < 0,
-        ])
+        )
         self._send_command(command)
 
     def get_time(self):
@@ -361,16 +799,8 @@ class NexStar:
             int: A Unix timestamp (seconds since 1 Jan 1970 in UTC minus leap seconds)
         """
         response = self._send_command(b'h', 8)
-        hand_controller_time = datetime.datetime(
-            response[5] + 2000, # year
-            response[3],        # month
-            response[4],        # day
-            response[0],        # hour
-            response[1],        # minute
-            response[2],        # second
-            0,                  # microseconds
-        )
-        return calendar.timegm(hand_controller_time.timetuple())
+        (hour, minute, second, month, day, year, _, _) = _TIME_STRUCT.unpack(response)
+        return calendar.timegm((year + 2000, month, day, hour, minute, second))
 
     def set_time(self, timestamp=None):
         """Set the time on the hand controller.
@@ -384,21 +814,19 @@ class NexStar:
                 If omitted, the time will be obtained from the clock of the machine running this
                 Python program.
         """
-        if timestamp is not None:
-            utc_time = datetime.datetime.utcfromtimestamp(timestamp)
-        else:
-            utc_time = datetime.datetime.utcnow()
-
-        command = b'H' + bytes([
-            utc_time.hour,
-            utc_time.minute,
-            utc_time.second,
-            utc_time.month,
-            utc_time.day,
-            utc_time.year - 2000,
+        utc_time = time.gmtime(timestamp)
+
+        command = _SET_TIME_STRUCT.pack(
+            b'H',
+            utc_time.tm_hour,
+            utc_time.tm_min,
+            utc_time.tm_sec,
+            utc_time.tm_mon,
+            utc_time.tm_mday,
+            utc_time.tm_year - 2000,
             0,  # UTC offset
             0,  # disable daylight savings
-        ])
+        )
         self._send_command(command)
 
     def get_gps_lock_status(self):
@@ -407,17 +835,7 @@ class NexStar:
         Returns:
             bool: True if GPS is linked (locked?), false if GPS is not linked (no lock?)
         """
-        command = b'P' + bytes([
-            1,
-            176,  # GPS Device ID?
-            55,  # Device register?
-            0,
-            0,
-            0,
-            1,  # GPS response bytes?
-        ])
-
-        response = self._send_command(command, 1)
+        response = self._send_command(_GPS_LOCK_STATUS_COMMAND, 1)
 
         return bool(response[0])
 
@@ -427,10 +845,10 @@ class NexStar:
         Returns:
             tuple of floats: A pair of angles (latitude, longitude) in signed degrees format.
         """
-        [x_var, y_var, z_var] = self._send_command(b'P' + bytes([1, 176, 1, 0, 0, 0, 3]), 3)
+        [x_var, y_var, z_var] = self._send_command(_GPS_LATITUDE_COMMAND, 3)
         lat = ((x_var * 65536) + (y_var * 256) + z_var) / (2. ** 24) * 360
 
-        [x_var, y_var, z_var] = self._send_command(b'P' + bytes([1, 176, 2, 0, 0, 0, 3]), 3)
+        [x_var, y_var, z_var] = self._send_command(_GPS_LONGITUDE_COMMAND, 3)
         lon = ((x_var * 65536) + (y_var * 256) + z_var) / (2. ** 24) * 360
 
         return (lat, lon)
@@ -441,24 +859,14 @@ class NexStar:
         Returns:
             int: A Unix timestamp (seconds since 1 Jan 1970 in UTC minus leap seconds)
         """
-        [x_var, y_var] = self._send_command(b'P' + bytes([1, 176, 4, 0, 0, 0, 2]), 2)
+        [x_var, y_var] = self._send_command(_GPS_YEAR_COMMAND, 2)
         year = (x_var * 256) + y_var
 
-        [month, day] = self._send_command(b'P' + bytes([1, 176, 3, 0, 0, 0, 2]), 2)
-
-        [hour, minute, second] = self._send_command(b'P' + bytes([1, 176, 51, 0, 0, 0, 3]), 3)
+        [month, day] = self._send_command(_GPS_DATE_COMMAND, 2)
 
-        hand_controller_time = datetime.datetime(
-            year,  # year
-            month,  # month
-            day,  # day
-            hour,  # hour
-            minute,  # minute
-            second,  # second
-            0,  # microseconds
-        )
+        [hour, minute, second] = self._send_command(_GPS_TIME_COMMAND, 3)
 
-        return calendar.timegm(hand_controller_time.timetuple())
+        return calendar.timegm((year, month, day, hour, minute, second))
 
     def get_version(self):
         """Get hand controller firmware version.
@@ -466,8 +874,7 @@ class NexStar:
         Returns:
             tuple of ints: Firmware version number as (major, minor) tuple.
         """
-        response = self._send_command(b'V', 2)
-        return (response[0], response[1])
+        return tuple(self._send_command(self._CMD_GET_VERSION, 2))
 
     def get_model(self):
         """Get mount model.
@@ -486,8 +893,7 @@ class NexStar:
             11 = 4/5 SE
             12 = 6/8 SE
         """
-        response = self._send_command(b'm', 1)
-        return response[0]
+        return self._send_command(self._CMD_GET_MODEL, 1)[0]
 
     def get_device_version(self, dev):
         """Get device firmware version.
@@ -508,15 +914,7 @@ class NexStar:
                 garbage. See the Developer Notes section of the serial protocol documentation for
                 details.
         """
-        command = b'P' + bytes([
-            1,
-            dev,
-            254,
-            0,
-            0,
-            0,
-            2,
-        ])
+        command = _PASS_THROUGH_STRUCT.pack(b'P', 1, dev, 254, 0, 0, 0, 2)
         response = self._send_command(command, 2)
         return (response[0], response[1])
 
@@ -550,8 +948,7 @@ class NexStar:
         Returns:
             bool: True if mount is aligned, False otherwise.
         """
-        response = self._send_command(b'J', 1)
-        return response[0] == 1
+        return self._send_command(self._CMD_ALIGNMENT_COMPLETE, 1)[0] == 1
 
     def goto_in_progress(self):
         """Check if a GOTO command is in progress.
@@ -564,12 +961,160 @@ class NexStar:
         Returns:
             bool: True if a GOTO is in progress, False otherwise.
         """
-        response = self._send_command(b'L', 1)
-        return response == b'1'
+        return self._send_command(self._CMD_GOTO_IN_PROGRESS, 1)[0] == 0x31  # ASCII '1'
+
+    def wait_for_goto(
+            self,
+            timeout=None,
+            initial=_GOTO_POLL_INITIAL_INTERVAL,
+            max_interval=_GOTO_POLL_MAX_INTERVAL,
+            num_polls=20,
+        ):
+        """Blocks until the GOTO in progress has completed.
+
+        The times at which goto_in_progress is polled are chosen from the durations of previous
+        GOTOs waited on by this method: polls are placed at evenly spaced quantiles of the observed
+        durations, up to the 99th percentile, so they are densest where completion is most likely.
+        Until enough history exists, or once a GOTO outlasts that schedule, the interval between
+        polls starts at initial and doubles after each poll up to max_interval.
+
+        Args:
+            timeout (float): Maximum time to wait in seconds, or None to wait indefinitely.
+            initial (float): First interval between polls in seconds when backing off.
+            max_interval (float): Maximum interval between polls in seconds when backing off.
+            num_polls (int): Number of polls to place using the history of GOTO durations.
+
+        Returns:
+            bool: True if the GOTO completed, False if the timeout expired first.
+
+        Raises:
+            ValueError: If initial is not positive or is greater than max_interval.
+        """
+        if not 0 < initial <= max_interval:
+            raise ValueError(
+                f'poll intervals must satisfy 0 < initial <= max_interval, got initial={initial} '
+                f'and max_interval={max_interval}')
+        now = time.monotonic()
+        start_time = self._goto_start_time
+        # only a GOTO started by _goto has a known start time and so a duration worth recording
+        record_duration = start_time is not None
+        if start_time is None:
+            start_time = now
+        deadline = None if timeout is None else now + timeout
+
+        # elapsed times at the latest poll and at the last poll that found the GOTO in progress
+        poll_time = last_busy_time = 0.
+        for scheduled_time in self._goto_poll_times(num_polls, initial, max_interval):
+            # when called late, skip the poll times already passed instead of polling back-to-back
+            if scheduled_time < time.monotonic() - start_time:
+                continue
+            wake_time = start_time + scheduled_time
+            if deadline is not None and wake_time >= deadline:
+                wake_time = deadline
+            delay = wake_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            poll_time = time.monotonic() - start_time
+            if not self.goto_in_progress():
+                break
+            if deadline is not None and wake_time == deadline:
+                return False
+            last_busy_time = poll_time
+
+        self._goto_start_time = None
+
+        # The GOTO finished somewhere between the last two polls. Recording the midpoint rather
+        # than the detection time keeps the history from drifting towards the poll times. Unless
+        # some poll saw the GOTO in progress the lower bound is unknown, so nothing is recorded.
+        if record_duration and last_busy_time > 0:
+            self._goto_durations.append((last_busy_time + poll_time) / 2)
+        return True
+
+    def _goto_poll_times(self, num_polls, initial, max_interval):
+        """Generates the times relative to the start of a GOTO at which to poll for completion.
+
+        Args:
+            num_polls (int): Number of polls to place using the history of GOTO durations.
+            initial (float): First interval in seconds once the history-based polls are used up.
+            max_interval (float): Maximum interval in seconds between polls.
+
+        Yields:
+            float: Poll times in seconds, in increasing order. The sequence is unbounded.
+        """
+        poll_time = 0.
+        if len(self._goto_durations) >= _GOTO_HISTORY_MIN_SAMPLES:
+            durations = sorted(self._goto_durations)
+            max_index = len(durations) - 1
+            for i in range(1, num_polls + 1):
+                # quantiles evenly spaced up to the 99th percentile
+                quantile = 0.99 * i / num_polls
+                duration = durations[round(quantile * max_index)]
+                if duration > poll_time:
+                    poll_time = duration
+                    yield poll_time
+
+        interval = initial
+        while True:
+            poll_time += interval
+            yield poll_time
+            interval = min(interval * 2, max_interval)
 
     def cancel_goto(self):
         """Cancels any GOTO operation that is in progress.
 
         Has no effect when no GOTO operation is in progress.
         """
-        self._send_command(b'M')
+        self._send_command(self._CMD_CANCEL_GOTO)
+
+
+class AsyncNexStar:  # pylint: disable=too-few-public-methods
+    """Wraps NexStar such that commands can be awaited without blocking the asyncio event loop.
+
+    Each public method of NexStar is available on this class as a coroutine function taking the
+    same arguments. The blocking serial I/O runs in the event loop's default executor while a lock
+    ensures that only one command is in progress on the serial port at a time. The pipelining
+    methods submit and reap are not exposed since they rely on the order of successive calls.
+
+    Attributes:
+        nexstar (NexStar): The wrapped synchronous NexStar object.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Constructs an AsyncNexStar object.
+
+        Args:
+            args, kwargs: Passed through to the NexStar constructor.
+        """
+        self.nexstar = NexStar(*args, **kwargs)
+
+        # Created on first use such that it belongs to the event loop that is running at the time
+        self._lock = None
+
+    def __getattr__(self, name):
+        """Returns a coroutine function wrapping the public NexStar method with the given name."""
+        if name.startswith('_') or name in ('submit', 'reap'):
+            raise AttributeError(name)
+        method = getattr(self.nexstar, name)
+        if not callable(method):
+            raise AttributeError(name)
+
+        async def wrapper(*args, **kwargs):
+            return await self._run(functools.partial(method, *args, **kwargs))
+
+        wrapper.__name__ = name
+        wrapper.__doc__ = method.__doc__
+        return wrapper
+
+    async def _run(self, function):
+        """Runs a blocking function in the default executor while holding the serial port lock.
+
+        Args:
+            function: A callable taking no arguments.
+
+        Returns:
+            The value returned by function.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            return await asyncio.get_running_loop().run_in_executor(None, function)